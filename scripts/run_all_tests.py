@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+"""
+Combined test runner for the Chest Analyzer.
+
+Runs the JavaScript (Jest) and Python (pytest) suites concurrently and
+prints a combined summary at the end.
+
+Usage:
+    python scripts/run_all_tests.py [--js-only | --python-only]
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _ColorsAnsi:
+    """ANSI color codes used for terminal output."""
+
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    CYAN = "\033[96m"
+
+
+class _ColorsPlain:
+    """No-op variant so non-TTY output (CI logs, redirects) stays clean."""
+
+    RESET = BOLD = RED = GREEN = YELLOW = BLUE = CYAN = ""
+
+
+_USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+Colors = _ColorsAnsi if _USE_COLOR else _ColorsPlain
+
+
+def log(message, color=Colors.RESET):
+    """Print a message in the given color (plain text off a TTY)."""
+    if not _USE_COLOR:
+        print(message)
+        return
+    print(f"{color}{message}{Colors.RESET}")
+
+
+def print_header(text):
+    """Print a prominent banner for a major phase of the run.
+
+    The whole banner is built as one bytes buffer and written in a single
+    call instead of five print()s, each of which would take the stdout
+    lock, encode and flush separately.
+    """
+    line = "=" * (len(text) + 8)
+    buf = (
+        f"\n\n{Colors.CYAN}{line}{Colors.RESET}\n"
+        f"{Colors.CYAN}{Colors.BOLD}    {text}    {Colors.RESET}\n"
+        f"{Colors.CYAN}{line}{Colors.RESET}\n\n\n"
+    ).encode()
+    # Flush pending text-layer output (log/print) first: writing to the
+    # underlying buffer bypasses it, and with a redirected stdout the
+    # banner would otherwise come out before earlier log lines.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
+
+
+def exec_fast_path(args):
+    """Replace this process with a shell that fans out both suites.
+
+    Skips the Python-level orchestration entirely: no runner modules are
+    loaded and no thread pool is managed, one bash process backgrounds
+    npm test and pytest and waits on both, propagating a failure from
+    either. Returns False when bash is unavailable (e.g. Windows) so the
+    caller can fall back to the thread-pool path; on success it does not
+    return.
+    """
+    import shlex
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    quoted = shlex.quote(project_dir)
+    python = shlex.quote(sys.executable)
+    jobs = []
+    if not args.python_only:
+        jobs.append(f"(cd {quoted} && npm test)")
+    if not args.js_only:
+        # Same as the threaded path: the standalone runner handles the
+        # pytest install check and test scaffolding, bare pytest does not.
+        jobs.append(f"(cd {quoted} && {python} scripts/run_pytest.py)")
+
+    if len(jobs) == 1:
+        command = jobs[0]
+    else:
+        command = (
+            f"{jobs[0]} & p1=$!; {jobs[1]} & p2=$!; "
+            "wait $p1; s1=$?; wait $p2; s2=$?; exit $((s1 > s2 ? s1 : s2))"
+        )
+    try:
+        os.execvp("bash", ["bash", "-c", command])
+    except OSError:
+        return False
+
+
+def _run_suite(command, project_dir):
+    """Run one suite as a subprocess, returning (exit_code, output bytes).
+
+    A missing executable (npm not installed) is reported as a failed
+    suite rather than crashing the combined runner with a traceback.
+    """
+    try:
+        result = subprocess.run(
+            command,
+            cwd=project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+    except OSError as exc:
+        return 1, f"{command[0]}: {exc}\n".encode()
+    return result.returncode, result.stdout
+
+
+def run_combined_tests(args):
+    """Run the requested suites concurrently and return True if all passed.
+
+    The suites are spawned directly as subprocesses — no loading of the
+    standalone runner scripts as modules, which re-executed two files and
+    their imports on every invocation. Dispatching both on a small thread
+    pool makes the wall-clock time max(JS, Python) instead of the sum;
+    each suite's output is flushed whole once it finishes so the two
+    streams do not garble the terminal.
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    commands = {}
+    if not args.python_only:
+        commands["javascript"] = [shutil.which("npm") or "npm", "test"]
+    if not args.js_only:
+        # Go through the standalone runner (as a subprocess, not a module
+        # import): it installs pytest and its plugins when missing and
+        # scaffolds tests/python, neither of which bare pytest would do on
+        # a fresh clone.
+        commands["python"] = [
+            sys.executable,
+            os.path.join("scripts", "run_pytest.py"),
+        ]
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            name: executor.submit(_run_suite, command, project_dir)
+            for name, command in commands.items()
+        }
+        for name, future in futures.items():
+            code, output = future.result()
+            sys.stdout.flush()  # keep ordering with text-layer writes
+            sys.stdout.buffer.write(output)
+            sys.stdout.buffer.flush()
+            results[name] = code == 0
+
+    print_header("Test Summary")
+    for name, passed in results.items():
+        if passed:
+            log(f"  {name}: PASSED", Colors.GREEN)
+        else:
+            log(f"  {name}: FAILED", Colors.RED)
+    return all(results.values())
+
+
+def parse_arguments(argv=None):
+    """Parse the command line arguments for the combined runner."""
+    import argparse  # deferred: only needed at CLI entry, saves cold start
+
+    parser = argparse.ArgumentParser(description="Run all test suites")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--js-only", action="store_true", help="run only the JavaScript suite"
+    )
+    group.add_argument(
+        "--python-only", action="store_true", help="run only the Python suite"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="fan both suites out from a single shell instead of Python threads",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point. Returns 0 if every requested suite passed."""
+    args = parse_arguments(argv)
+    if args.fast and os.name == "posix":
+        exec_fast_path(args)  # only returns if bash could not be exec'd
+        log("bash unavailable, falling back to threaded runner", Colors.YELLOW)
+    print_header("Combined Test Runner")
+    return 0 if run_combined_tests(args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,548 @@
+#!/usr/bin/env python
+"""
+Python test runner for the Chest Analyzer.
+
+Checks that pytest is available (installing it if necessary), makes sure
+the tests/python directory structure exists and then runs pytest with the
+requested options.
+
+Usage:
+    python scripts/run_pytest.py [--unit | --integration | --validation]
+                                 [--coverage] [--html] [--verbose] [--jobs N]
+"""
+
+import os
+import sys
+import subprocess
+import json
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _ColorsAnsi:
+    """ANSI color codes used for terminal output."""
+
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    CYAN = "\033[96m"
+
+
+class _ColorsPlain:
+    """No-op variant so non-TTY output (CI logs, redirects) stays clean."""
+
+    RESET = BOLD = RED = GREEN = YELLOW = BLUE = CYAN = ""
+
+
+_USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+Colors = _ColorsAnsi if _USE_COLOR else _ColorsPlain
+
+
+def log(message, color=Colors.RESET):
+    """Print a message in the given color (plain text off a TTY)."""
+    if not _USE_COLOR:
+        print(message)
+        return
+    print(f"{color}{message}{Colors.RESET}")
+
+
+def print_header(text):
+    """Print a prominent banner for a major phase of the run.
+
+    The whole banner is built as one bytes buffer and written in a single
+    call instead of five print()s, each of which would take the stdout
+    lock, encode and flush separately.
+    """
+    line = "=" * (len(text) + 8)
+    buf = (
+        f"\n\n{Colors.CYAN}{line}{Colors.RESET}\n"
+        f"{Colors.CYAN}{Colors.BOLD}    {text}    {Colors.RESET}\n"
+        f"{Colors.CYAN}{line}{Colors.RESET}\n\n\n"
+    ).encode()
+    # Flush pending text-layer output (log/print) first: writing to the
+    # underlying buffer bypasses it, and with a redirected stdout the
+    # banner would otherwise come out before earlier log lines.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
+
+
+def print_section(text):
+    """Print a smaller banner for a sub-step of the run."""
+    line = "-" * (len(text) + 4)
+    buf = (
+        f"{Colors.BLUE}{line}{Colors.RESET}\n"
+        f"{Colors.BLUE}  {text}  {Colors.RESET}\n"
+        f"{Colors.BLUE}{line}{Colors.RESET}\n"
+    ).encode()
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
+
+
+def stream_output(process):
+    """Forward a child process's stdout in large binary chunks.
+
+    read1() returns as soon as any data is available, like os.read, but
+    goes through the BufferedReader so it behaves the same on every
+    platform. No TextIOWrapper means no per-line newline scan and no
+    UTF-8 decode/encode round trip, which adds up on chatty pytest
+    output.
+    """
+    if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+        try:
+            fcntl.fcntl(process.stdout.fileno(), fcntl.F_SETPIPE_SZ, 1 << 20)
+        except OSError:
+            pass
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    out = sys.stdout.buffer
+    while chunk := process.stdout.read1(65536):
+        out.write(chunk)
+        out.flush()
+    process.stdout.close()
+
+
+def run_command(command, cwd=None):
+    """Run a command and return (exit_code, combined output).
+
+    Prefer passing an argv list; a plain string falls back to shell=True
+    for the rare caller that really needs shell features.
+    """
+    try:
+        result = subprocess.run(
+            command,
+            shell=isinstance(command, str),
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode, result.stdout + result.stderr
+    except FileNotFoundError as exc:
+        return 1, str(exc)
+    except Exception as exc:  # pragma: no cover - defensive
+        return 1, str(exc)
+
+
+def _pytest_stamp_path(project_dir):
+    """Path of the stamp file recording the last successful pytest check."""
+    return os.path.join(project_dir, ".cache", "webapp-tests", "pytest.json")
+
+
+def _pytest_cache_ok(project_dir, plugins):
+    """True if the check already passed for this interpreter and plugins."""
+    try:
+        with open(_pytest_stamp_path(project_dir)) as f:
+            stamp = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+    return stamp.get("python") == sys.executable and set(plugins) <= set(
+        stamp.get("plugins", [])
+    )
+
+
+def _write_pytest_stamp(project_dir, plugins):
+    """Record that the check passed for this interpreter and plugin set."""
+    stamp_path = _pytest_stamp_path(project_dir)
+    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+    with open(stamp_path, "w") as f:
+        json.dump({"python": sys.executable, "plugins": sorted(plugins)}, f)
+
+
+# Importable module name -> pip package, for every plugin a built command
+# might reference.
+_PLUGIN_PACKAGES = {
+    "xdist": "pytest-xdist",
+    "pytest_cov": "pytest-cov",
+    "pytest_html": "pytest-html",
+    "testmon": "pytest-testmon",
+}
+
+
+def _required_plugins(args):
+    """The plugin modules the command built from these args will need."""
+    # --testmon and -n are mutually exclusive on the built command, so
+    # exactly one of xdist/testmon is needed per run.
+    required = ["testmon"] if args.testmon else ["xdist"]
+    if args.coverage:
+        required.append("pytest_cov")
+    if args.html:
+        required.append("pytest_html")
+    return tuple(required)
+
+
+def check_pytest(project_dir, plugins=(), force=False):
+    """Check that pytest and the needed plugins are installed.
+
+    pytest alone is not enough: the built command always passes plugin
+    options (-n at minimum), so each required plugin module is verified
+    too and whatever is missing gets installed in one pip call. A stamp
+    from a previous successful check (keyed on the interpreter and the
+    plugin set) skips even the in-process lookups.
+    """
+    if not force and _pytest_cache_ok(project_dir, plugins):
+        log("pytest check cached as passing, skipping", Colors.GREEN)
+        return True
+    print_section("Checking pytest installation")
+    # find_spec answers "is this importable" with a sys.path lookup in
+    # microseconds; no need to fork a pytest --version subprocess.
+    import importlib.util
+
+    missing = []
+    if importlib.util.find_spec("pytest") is None:
+        missing.append("pytest")
+    missing.extend(
+        _PLUGIN_PACKAGES[name]
+        for name in plugins
+        if importlib.util.find_spec(name) is None
+    )
+    if not missing:
+        try:
+            import importlib.metadata
+
+            version = importlib.metadata.version("pytest")
+        except Exception:
+            version = "unknown version"
+        log(f"Found pytest {version} with required plugins", Colors.GREEN)
+        _write_pytest_stamp(project_dir, plugins)
+        return True
+    log(f"Installing missing test packages: {', '.join(missing)}", Colors.YELLOW)
+    # python -m pip, not bare pip: the pip on PATH can belong to another
+    # interpreter (system pip vs venv python), which would install the
+    # packages somewhere this interpreter never sees.
+    code, output = run_command([sys.executable, "-m", "pip", "install", *missing])
+    if code != 0:
+        log("Failed to install test packages:", Colors.RED)
+        log(output, Colors.RED)
+        return False
+    # Re-probe before writing the stamp: the finders cached the misses
+    # from above, and a stamp written on faith would make every later run
+    # skip this check and fail at pytest time instead.
+    import importlib
+
+    importlib.invalidate_caches()
+    still_missing = [
+        name
+        for name in ("pytest", *plugins)
+        if importlib.util.find_spec(name) is None
+    ]
+    if still_missing:
+        log(
+            f"Packages still not importable after install: {', '.join(still_missing)}",
+            Colors.RED,
+        )
+        return False
+    log("Installed test packages", Colors.GREEN)
+    _write_pytest_stamp(project_dir, plugins)
+    return True
+
+
+def _has_real_test(path):
+    """True if the directory contains a .py file other than __init__.py.
+
+    A single scandir early-exits on the first hit instead of materializing
+    the whole directory listing the way glob does.
+    """
+    with os.scandir(path) as entries:
+        return any(
+            entry.name.endswith(".py")
+            and entry.name != "__init__.py"
+            and entry.is_file()
+            for entry in entries
+        )
+
+
+# Scaffold layout, precomputed once: (subdirectory, sample test source).
+_SAMPLE_TESTS = (
+    (
+        "unit",
+        '"""Sample unit test."""\n'
+        "\n"
+        "\n"
+        "def test_sample_unit():\n"
+        "    assert 1 + 1 == 2\n",
+    ),
+    (
+        "integration",
+        '"""Sample integration test."""\n'
+        "\n"
+        "\n"
+        "def test_sample_integration():\n"
+        "    assert isinstance([], list)\n",
+    ),
+    (
+        "validation",
+        '"""Sample validation test."""\n'
+        "\n"
+        "\n"
+        "def test_sample_validation():\n"
+        "    assert sorted([3, 1, 2]) == [1, 2, 3]\n",
+    ),
+)
+
+
+def ensure_test_directories(project_dir):
+    """Make sure the tests/python directory structure exists.
+
+    One pass over the precomputed layout: each os.makedirs call walks the
+    whole subtree at once (creating tests/python on the way), and files
+    are only written after a missing stat, so the common "already there"
+    path costs one stat per entry.
+    """
+    python_tests_dir = os.path.join(project_dir, "tests", "python")
+    for name, source in _SAMPLE_TESTS:
+        subdir_path = os.path.join(python_tests_dir, name)
+        os.makedirs(subdir_path, exist_ok=True)
+        init_file = os.path.join(subdir_path, "__init__.py")
+        if not os.path.exists(init_file):
+            open(init_file, "w").close()
+        if not _has_real_test(subdir_path):
+            sample_file = os.path.join(subdir_path, f"test_sample_{name}.py")
+            with open(sample_file, "w") as f:
+                f.write(source)
+            log(f"Created sample test {os.path.basename(sample_file)}", Colors.YELLOW)
+
+    root_init = os.path.join(python_tests_dir, "__init__.py")
+    if not os.path.exists(root_init):
+        open(root_init, "w").close()
+
+
+def _daemon_socket_path(project_dir):
+    """Path of the Unix socket a running pytest daemon listens on."""
+    return os.path.join(project_dir, ".cache", "webapp-tests", "pytest-daemon.sock")
+
+
+def run_daemon(project_dir):
+    """Serve pytest runs from a long-lived worker process.
+
+    Every one-shot invocation pays pytest's startup cost: interpreter
+    warmup, conftest collection and plugin registration. The daemon keeps
+    pytest imported in this interpreter and accepts JSON requests
+    ({"args": [...]}) over a Unix socket, running pytest.main in-process
+    and streaming the output back followed by an "EXIT <code>" trailer.
+    A {"command": "stop"} request shuts it down.
+    """
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        log("Daemon mode needs AF_UNIX sockets (unsupported here)", Colors.RED)
+        return 1
+    import pytest
+
+    sock_path = _daemon_socket_path(project_dir)
+    os.makedirs(os.path.dirname(sock_path), exist_ok=True)
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(sock_path)
+        server.listen(1)
+        log(f"pytest daemon listening on {sock_path}", Colors.GREEN)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request = json.loads(conn.makefile("r").readline() or "{}")
+                except json.JSONDecodeError:
+                    continue
+                if request.get("command") == "stop":
+                    log("pytest daemon stopping", Colors.YELLOW)
+                    return 0
+                wfile = conn.makefile("w")
+                old_stdout = sys.stdout
+                sys.stdout = wfile
+                try:
+                    code = pytest.main(request.get("args", []))
+                finally:
+                    sys.stdout = old_stdout
+                wfile.write(f"\nEXIT {int(code)}\n")
+                wfile.flush()
+    finally:
+        server.close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+
+
+def _run_via_daemon(command, project_dir):
+    """Send a run to a live daemon if one exists.
+
+    Returns the exit code, or None when no daemon is reachable so the
+    caller falls back to the one-shot path. command[0] is the pytest
+    executable and is stripped; the rest goes to pytest.main as-is.
+    """
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock_path = _daemon_socket_path(project_dir)
+    if not os.path.exists(sock_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(sock_path)
+    except OSError:
+        return None
+    with client:
+        client.sendall((json.dumps({"args": command[1:]}) + "\n").encode())
+        chunks = []
+        while chunk := client.recv(65536):
+            chunks.append(chunk)
+    output = b"".join(chunks)
+    body, sep, trailer = output.rpartition(b"\nEXIT ")
+    if not sep:
+        return None
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    sys.stdout.buffer.write(body)
+    sys.stdout.buffer.flush()
+    try:
+        return int(trailer.strip())
+    except ValueError:
+        return 1
+
+
+def run_pytest(args, project_dir, allow_exec=False):
+    """Build the pytest command from the parsed args and stream its output.
+
+    With allow_exec=True and no post-run processing pending (no coverage
+    or HTML report), the interpreter is replaced with pytest via execvp:
+    one fewer process and pipe, and pytest inherits the tty for native
+    color output. Callers that need the return code (the combined
+    runner) leave allow_exec off.
+    """
+    command = ["pytest"]
+
+    # Shard the run across worker processes (pytest-xdist). Defaults to
+    # cpu_count - 2 so the machine stays responsive during a run.
+    # pytest-testmon does not run under xdist (it deactivates itself), so
+    # the testmon path stays single-process: it wins by selecting fewer
+    # tests, not by parallelism.
+    if not args.testmon:
+        command.extend(["-n", str(args.jobs)])
+
+    tests_root = os.path.join(project_dir, "tests", "python")
+    if args.unit:
+        command.append(os.path.join(tests_root, "unit"))
+    elif args.integration:
+        command.append(os.path.join(tests_root, "integration"))
+    elif args.validation:
+        command.append(os.path.join(tests_root, "validation"))
+    else:
+        command.append(tests_root)
+
+    if args.testmon:
+        # pytest-testmon: only re-run tests whose covered code changed
+        # since the last green run. Keep its database with the rest of the
+        # pytest state so CI caching picks it up.
+        command.append("--testmon")
+        os.environ.setdefault(
+            "TESTMON_DATAFILE",
+            os.path.join(project_dir, ".pytest_cache", "testmondata"),
+        )
+
+    if args.verbose:
+        command.append("-v")
+    if args.coverage:
+        command.extend(["--cov=app", "--cov-report=term-missing"])
+    if args.html:
+        command.extend(["--html=pytest-report.html", "--self-contained-html"])
+
+    daemon_code = _run_via_daemon(command, project_dir)
+    if daemon_code is not None:
+        return daemon_code
+
+    if allow_exec and not args.coverage and not args.html:
+        log(f"Running: {' '.join(command)}", Colors.BLUE)
+        # exec replaces the process without running stdio cleanup; flush
+        # so the line above survives in redirected runs.
+        sys.stdout.flush()
+        try:
+            os.chdir(project_dir)
+            os.execvp(command[0], command)
+        except OSError:
+            pass  # pytest not spawnable this way; use the managed path
+
+    log(f"Running: {' '.join(command)}", Colors.BLUE)
+    process = subprocess.Popen(
+        command,
+        cwd=project_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=65536,
+    )
+    stream_output(process)
+    return process.wait()
+
+
+def parse_arguments(argv=None):
+    """Parse the command line arguments for the Python test runner."""
+    import argparse  # deferred: only needed at CLI entry, saves cold start
+
+    parser = argparse.ArgumentParser(description="Run the Python test suite")
+    parser.add_argument("--unit", action="store_true", help="run only unit tests")
+    parser.add_argument(
+        "--integration", action="store_true", help="run only integration tests"
+    )
+    parser.add_argument(
+        "--validation", action="store_true", help="run only validation tests"
+    )
+    parser.add_argument("--coverage", action="store_true", help="collect coverage")
+    parser.add_argument(
+        "--html", action="store_true", help="write a self-contained HTML report"
+    )
+    parser.add_argument("--verbose", action="store_true", help="verbose pytest output")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) - 2),
+        help="number of pytest-xdist workers (default: cpu count - 2)",
+    )
+    parser.add_argument(
+        "--force-check",
+        action="store_true",
+        help="re-run the pytest installation check even if cached as passing",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run as a long-lived worker serving pytest runs over a socket",
+    )
+    parser.add_argument(
+        "--testmon",
+        action="store_true",
+        help="only run tests affected by code changed since the last green run",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point. Returns the pytest exit code."""
+    args = parse_arguments(argv)
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    print_header("Python Test Runner")
+    if not check_pytest(
+        project_dir, plugins=_required_plugins(args), force=args.force_check
+    ):
+        return 1
+    ensure_test_directories(project_dir)
+
+    if args.daemon:
+        return run_daemon(project_dir)
+
+    # Standalone CLI runs (argv is None) may exec pytest directly; the
+    # combined runner passes an argv list and needs the return code.
+    exit_code = run_pytest(args, project_dir, allow_exec=argv is None)
+    if exit_code == 0:
+        log("All Python tests passed", Colors.GREEN)
+    else:
+        log(f"Python tests failed (exit code {exit_code})", Colors.RED)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
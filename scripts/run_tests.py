@@ -0,0 +1,770 @@
+#!/usr/bin/env python
+"""
+JavaScript test runner for the Chest Analyzer.
+
+Verifies that node/npm are installed, makes sure the npm dependencies
+(including Jest) are present and then runs the Jest suite through the
+npm scripts defined in package.json.
+
+Usage:
+    python scripts/run_tests.py [--unit | --integration]
+                                [--coverage] [--watch] [--verbose]
+"""
+
+import functools
+import os
+import sys
+import subprocess
+import json
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Resolved once at import; os.name is a plain constant, unlike
+# platform.system() which does real work on first use.
+IS_WINDOWS = os.name == "nt"
+_JEST_BIN = "jest.cmd" if IS_WINDOWS else "jest"
+
+
+class _ColorsAnsi:
+    """ANSI color codes used for terminal output."""
+
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    CYAN = "\033[96m"
+
+
+class _ColorsPlain:
+    """No-op variant so non-TTY output (CI logs, redirects) stays clean."""
+
+    RESET = BOLD = RED = GREEN = YELLOW = BLUE = CYAN = ""
+
+
+_USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+Colors = _ColorsAnsi if _USE_COLOR else _ColorsPlain
+
+
+# Precomputed so log() does one write per call instead of print()'s
+# two (payload + newline), with no concatenation in the no-color case.
+_RESET = Colors.RESET
+
+
+def log(message, color=_RESET):
+    """Print a message in the given color (plain text off a TTY)."""
+    if not _USE_COLOR:
+        sys.stdout.write(message + "\n")
+        return
+    sys.stdout.write(f"{color}{message}{_RESET}\n")
+
+
+def print_header(text):
+    """Print a prominent banner for a major phase of the run.
+
+    The whole banner is built as one bytes buffer and written in a single
+    call instead of five print()s, each of which would take the stdout
+    lock, encode and flush separately.
+    """
+    line = "=" * (len(text) + 8)
+    buf = (
+        f"\n\n{Colors.CYAN}{line}{Colors.RESET}\n"
+        f"{Colors.CYAN}{Colors.BOLD}    {text}    {Colors.RESET}\n"
+        f"{Colors.CYAN}{line}{Colors.RESET}\n\n\n"
+    ).encode()
+    # Flush pending text-layer output (log/print) first: writing to the
+    # underlying buffer bypasses it, and with a redirected stdout the
+    # banner would otherwise come out before earlier log lines.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
+
+
+def print_section(text):
+    """Print a smaller banner for a sub-step of the run."""
+    line = "-" * (len(text) + 4)
+    buf = (
+        f"{Colors.BLUE}{line}{Colors.RESET}\n"
+        f"{Colors.BLUE}  {text}  {Colors.RESET}\n"
+        f"{Colors.BLUE}{line}{Colors.RESET}\n"
+    ).encode()
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
+
+
+def stream_output(process):
+    """Forward a child process's stdout in large binary chunks.
+
+    On POSIX the raw pipe fd is read directly with os.read, skipping even
+    the BufferedReader layer; elsewhere read1() provides the same
+    returns-as-soon-as-data-arrives behavior portably. Either way the
+    pipe stays binary: no per-line newline scan, no UTF-8 decode/encode
+    round trip, which adds up on verbose Jest output.
+    """
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    out = sys.stdout.buffer
+    if not IS_WINDOWS:
+        fd = process.stdout.fileno()
+        if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+            try:
+                fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, 1 << 20)
+            except OSError:
+                pass
+        while chunk := os.read(fd, 65536):
+            out.write(chunk)
+            out.flush()
+    else:
+        while chunk := process.stdout.read1(65536):
+            out.write(chunk)
+            out.flush()
+    process.stdout.close()
+
+
+def run_command(command, cwd=None):
+    """Run a command and return (exit_code, combined output).
+
+    Prefer passing an argv list; a plain string falls back to shell=True
+    for the rare caller that really needs shell features.
+    """
+    try:
+        result = subprocess.run(
+            command,
+            shell=isinstance(command, str),
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode, result.stdout + result.stderr
+    except FileNotFoundError as exc:
+        return 1, str(exc)
+    except Exception as exc:  # pragma: no cover - defensive
+        return 1, str(exc)
+
+
+def _npm():
+    """Resolve the npm executable (npm.cmd on Windows)."""
+    return shutil.which("npm") or "npm"
+
+
+def _prereq_stamp_path(project_dir):
+    """Path of the stamp file recording the last successful check."""
+    return project_dir / ".cache" / "webapp-tests" / "prereq.json"
+
+
+def _prereq_key(project_dir):
+    """Fingerprint of the state the prerequisite checks depend on."""
+    try:
+        return {
+            "package_json_mtime": os.stat(project_dir / "package.json").st_mtime_ns,
+            "node_modules_mtime": os.stat(project_dir / "node_modules").st_mtime_ns,
+            "python": sys.executable,
+        }
+    except OSError:
+        return None
+
+
+def _prereq_cache_ok(project_dir):
+    """True if the stamp matches the current state, so probes can be skipped."""
+    try:
+        with open(_prereq_stamp_path(project_dir)) as f:
+            stamp = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+    key = _prereq_key(project_dir)
+    return key is not None and stamp == key
+
+
+def _write_prereq_stamp(project_dir):
+    """Record that all checks passed for the current state."""
+    key = _prereq_key(project_dir)
+    if key is None:
+        return
+    stamp_path = _prereq_stamp_path(project_dir)
+    os.makedirs(stamp_path.parent, exist_ok=True)
+    with open(stamp_path, "w") as f:
+        json.dump(key, f)
+
+
+def _npm_version_from_disk():
+    """Read npm's version from its own package.json instead of spawning it.
+
+    npm ships alongside node: <prefix>/lib/node_modules/npm/package.json
+    on POSIX, next to node.exe on Windows. Returns None when unreadable.
+    """
+    node_path = shutil.which("node")
+    if not node_path:
+        return None
+    node_dir = os.path.dirname(os.path.realpath(node_path))
+    candidates = (
+        os.path.join(os.path.dirname(node_dir), "lib", "node_modules", "npm"),
+        os.path.join(node_dir, "node_modules", "npm"),
+    )
+    for npm_dir in candidates:
+        try:
+            with open(os.path.join(npm_dir, "package.json")) as f:
+                return json.load(f).get("version")
+        except (OSError, json.JSONDecodeError):
+            continue
+    return None
+
+
+# Probe results per PATH, so watch-style re-invocations in the same
+# environment never re-probe.
+_node_probe_cache = {}
+
+
+@functools.lru_cache(maxsize=1)
+def node_version():
+    """node's version string, spawned lazily and at most once."""
+    try:
+        return subprocess.check_output(
+            ["node", "--version"], text=True, stderr=subprocess.STDOUT
+        ).strip()
+    except (subprocess.CalledProcessError, FileNotFoundError, OSError):
+        return None
+
+
+def ensure_node_installed():
+    """Check that node and npm are available on PATH.
+
+    Presence is answered by shutil.which — a directory scan, no process
+    spawn at all. npm's version is read from its package.json on disk;
+    node's is only fetched (once, via node_version) for the log line.
+    The combined result is memoized on PATH. Returns a
+    (node_installed, npm_installed) tuple.
+    """
+    cache_key = os.environ.get("PATH", "")
+    if cache_key in _node_probe_cache:
+        return _node_probe_cache[cache_key]
+
+    node_installed = shutil.which("node") is not None
+    if node_installed:
+        log(f"Found node {node_version() or ''}".rstrip(), Colors.GREEN)
+    else:
+        log("node is not installed or not on PATH", Colors.RED)
+
+    npm_installed = False
+    npm_version = _npm_version_from_disk()
+    if npm_version is not None:
+        log(f"Found npm {npm_version}", Colors.GREEN)
+        npm_installed = True
+    elif shutil.which("npm") is not None:
+        log("Found npm (version not readable from disk)", Colors.GREEN)
+        npm_installed = True
+    else:
+        log("npm is not installed or not on PATH", Colors.RED)
+
+    _node_probe_cache[cache_key] = (node_installed, npm_installed)
+    return node_installed, npm_installed
+
+
+def check_prerequisites(project_dir, force=False):
+    """Check that node and npm are installed before running anything.
+
+    When a fresh stamp from a previous successful run exists, the version
+    probes (three subprocess spawns) are skipped entirely; one os.stat
+    pair answers the same question.
+    """
+    if not force and _prereq_cache_ok(project_dir):
+        log("Prerequisites unchanged since last run, skipping checks", Colors.GREEN)
+        return True
+    print_section("Checking prerequisites")
+    node_installed, npm_installed = ensure_node_installed()
+    return node_installed and npm_installed
+
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads  # 2-5x faster than stdlib json when present
+except ImportError:
+    _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=8)
+def _load_package_json(path_str, mtime_ns, size):
+    """Parse a package.json once per (path, mtime, size) fingerprint."""
+    try:
+        with open(path_str, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def load_package_json(path):
+    """Cached package.json load; returns {} when missing or invalid.
+
+    The stat fingerprint in the cache key means edits invalidate the
+    entry automatically while repeat reads within (and across) calls are
+    a hashtable hit.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    return _load_package_json(str(path), st.st_mtime_ns, st.st_size)
+
+
+def get_jest_config_from_package(project_dir):
+    """Read the jest configuration block from package.json, if any."""
+    return load_package_json(project_dir / "package.json").get("jest", {})
+
+
+_JEST_DEV_DEPS = ("jest", "jest-environment-jsdom", "@testing-library/jest-dom")
+
+# Applied to every npm invocation: pull from the local cache where
+# possible and skip the audit/funding reporters' registry round-trips.
+NPM_FAST_FLAGS = ("--prefer-offline", "--no-audit", "--no-fund", "--loglevel=error")
+
+
+def _npm_flags(run_scripts=False):
+    """npm flags for installs; on CI lifecycle scripts are skipped too."""
+    flags = list(NPM_FAST_FLAGS)
+    if os.environ.get("CI") and not run_scripts:
+        flags.append("--ignore-scripts")
+    return flags
+
+
+def _lock_cache_path(project_dir):
+    """Sidecar file storing the hash of the last installed package-lock."""
+    return project_dir / ".cache" / "webapp-tests" / "lock.sha256"
+
+
+def _lock_hash(package_lock):
+    """SHA-256 of package-lock.json, the cache key for installs."""
+    import hashlib
+
+    return hashlib.sha256(package_lock.read_bytes()).hexdigest()
+
+
+def _ready_stamp_path(project_dir):
+    """Stamp written after a fully successful dependency check."""
+    return project_dir / ".cache" / "webapp-tests" / "ready"
+
+
+def _ready_stamp_ok(project_dir):
+    """True if the ready stamp matches the current package-lock hash."""
+    package_lock = project_dir / "package-lock.json"
+    try:
+        return (
+            package_lock.exists()
+            and _ready_stamp_path(project_dir).read_text() == _lock_hash(package_lock)
+        )
+    except OSError:
+        return False
+
+
+def _write_ready_stamp(project_dir):
+    """Record the package-lock hash so watch-mode restarts can skip checks."""
+    package_lock = project_dir / "package-lock.json"
+    if not package_lock.exists():
+        return
+    stamp = _ready_stamp_path(project_dir)
+    stamp.parent.mkdir(parents=True, exist_ok=True)
+    stamp.write_text(_lock_hash(package_lock))
+    # Children re-invoking this script (watch loops) inherit the hint.
+    os.environ["WEBAPP_TESTS_READY"] = "1"
+
+
+def ensure_dependencies(project_dir, run_scripts=False):
+    """Make sure node_modules and the Jest packages are installed.
+
+    Whatever is missing is installed with a single npm invocation, so the
+    dependency graph is resolved at most once instead of the old
+    npm install followed by a second npm install --save-dev for Jest.
+    """
+    node_modules = project_dir / "node_modules"
+    jest_bin = node_modules / ".bin" / _JEST_BIN
+    package_json = project_dir / "package.json"
+    installed_lock = node_modules / ".package-lock.json"
+
+    # With a lockfile and Jest declared in package.json, one sha256
+    # against the sidecar decides everything: a hit skips all filesystem
+    # probes and npm. When Jest is not declared, npm ci could never
+    # install it, so that case falls through to the combined install.
+    package_lock = project_dir / "package-lock.json"
+    declared = load_package_json(package_json).get("devDependencies", {})
+    lock_usable = package_lock.exists() and "jest" in declared
+    lock_hash = _lock_hash(package_lock) if lock_usable else None
+    cache_path = _lock_cache_path(project_dir)
+    stored_hash = None
+    if lock_usable:
+        try:
+            stored_hash = cache_path.read_text()
+        except OSError:
+            pass
+        if stored_hash == lock_hash:
+            return True
+
+    # Common case: the installed tree is at least as new as package.json
+    # and Jest is present -- nothing to do. Only a *missing* sidecar --
+    # fresh clone, CI restoring node_modules but not .cache -- earns this
+    # trust (seeding the hash so the next run is a single compare); a
+    # stored hash that mismatches means the tree was built from another
+    # lockfile and must fall through to npm ci below.
+    if stored_hash is None:
+        try:
+            if (
+                jest_bin.exists()
+                and installed_lock.stat().st_mtime_ns
+                >= package_json.stat().st_mtime_ns
+            ):
+                if lock_hash is not None:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_text(lock_hash)
+                return True
+        except OSError:
+            pass
+
+    # Genuine mismatch (or never installed): a deterministic npm ci
+    # rebuilds node_modules from the lockfile and records the new hash.
+    if lock_usable:
+        log("package-lock.json changed, running npm ci...", Colors.YELLOW)
+        code, output = run_command(
+            [_npm(), "ci", *_npm_flags(run_scripts)], cwd=project_dir
+        )
+        if code != 0:
+            log("npm ci failed:", Colors.RED)
+            log(output, Colors.RED)
+            return False
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(lock_hash)
+        return True
+
+    # Only name the Jest packages explicitly when package.json does not
+    # already declare them; npm installs the declared tree either way.
+    missing = [pkg for pkg in _JEST_DEV_DEPS if pkg not in declared]
+
+    command = [_npm(), "install", *_npm_flags(run_scripts)]
+    if missing:
+        command.append("--save-dev")
+        command.extend(missing)
+
+    log("Installing npm dependencies...", Colors.YELLOW)
+    code, output = run_command(command, cwd=project_dir)
+    if code != 0:
+        log("npm install failed:", Colors.RED)
+        log(output, Colors.RED)
+        return False
+    return True
+
+
+def check_dependencies(project_dir, force=False, run_scripts=False):
+    """Check (and if needed install) the npm test dependencies.
+
+    Writes the prerequisite stamp once everything checks out so the next
+    run can skip both this and check_prerequisites.
+    """
+    if not force and _prereq_cache_ok(project_dir):
+        log("Dependencies unchanged since last run, skipping checks", Colors.GREEN)
+        return True
+    print_section("Checking dependencies")
+    if not ensure_dependencies(project_dir, run_scripts=run_scripts):
+        return False
+    _write_prereq_stamp(project_dir)
+    _write_ready_stamp(project_dir)
+    return True
+
+
+def _jest_cache_args(project_dir):
+    """Common Jest flags pinning the transform cache inside the project.
+
+    Jest's default cache lands in a temp path that CI wipes between runs,
+    forcing babel re-transforms of every source file. Pinning it under
+    .cache/jest lets CI cache actions persist it (key it on the
+    package-lock hash alongside the npm cache). --ci is added when the CI
+    env var is set so Jest will not write new snapshots.
+    """
+    cache_dir = project_dir / ".cache" / "jest"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    flags = [f"--cacheDirectory={cache_dir}"]
+    if os.environ.get("CI"):
+        flags.append("--ci")
+    return flags
+
+
+def _merge_file_coverage(merged, filename, entry):
+    """Fold one file's istanbul coverage entry into the merged map.
+
+    Shards partition test files, not sources, so the same source file can
+    show up in several shards with identical statement/function/branch
+    maps; merging is just summing the hit counters per key.
+    """
+    base = merged.get(filename)
+    if base is None:
+        merged[filename] = entry
+        return
+    for section in ("s", "f"):
+        counters = base.setdefault(section, {})
+        for key, count in entry.get(section, {}).items():
+            counters[key] = counters.get(key, 0) + count
+    branches = base.setdefault("b", {})
+    for key, counts in entry.get("b", {}).items():
+        merged_counts = branches.get(key)
+        if merged_counts is None:
+            branches[key] = list(counts)
+            continue
+        for j, count in enumerate(counts):
+            if j < len(merged_counts):
+                merged_counts[j] += count
+            else:
+                merged_counts.append(count)
+
+
+def _merge_shard_coverage(project_dir, shards):
+    """Combine the per-shard coverage-final.json files into merged.json.
+
+    Done in-process: istanbul's JSON format is a plain per-file dict, and
+    merging it here avoids shipping nyc as a devDependency (and the npx
+    registry fetch that pulling it at run time would cost).
+    """
+    merged = {}
+    for i in range(1, shards + 1):
+        shard_json = project_dir / ".coverage" / f"shard-{i}" / "coverage-final.json"
+        try:
+            with open(shard_json, "rb") as f:
+                shard_coverage = _json_loads(f.read())
+        except (OSError, ValueError):
+            continue
+        for filename, entry in shard_coverage.items():
+            _merge_file_coverage(merged, filename, entry)
+    out_path = project_dir / ".coverage" / "merged.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(merged, f)
+    return out_path
+
+
+def _pump_output(process, prefix):
+    """Forward one shard's output with a line prefix so streams stay apart."""
+    sys.stdout.flush()  # keep ordering with text-layer writes
+    out = sys.stdout.buffer
+    for line in process.stdout:
+        out.write(prefix + line)
+        out.flush()
+    process.stdout.close()
+
+
+def run_sharded_tests(args, project_dir, jest_js):
+    """Fan the suite out across N concurrent Jest processes with --shard.
+
+    Even with internal workers a single Jest invocation serializes suite
+    discovery and coverage reporting. Each shard runs as its own process,
+    pumped to stdout through a thread with a [shard i/N] prefix; with
+    --coverage every shard writes to .coverage/shard-i and the pieces are
+    merged in-process once all shards exit. Returns the worst exit code.
+    """
+    import threading
+
+    shards = args.shards if args.shards > 0 else max(1, (os.cpu_count() or 2) - 2)
+    # Split the usual cpu-2 worker budget across the shards; left to its
+    # default every shard would size itself for the whole machine and N
+    # shards would oversubscribe it N-fold.
+    workers = max(1, ((os.cpu_count() or 2) - 2) // shards)
+    processes = []
+    for i in range(1, shards + 1):
+        command = [
+            "node",
+            str(jest_js),
+            f"--shard={i}/{shards}",
+            f"--maxWorkers={workers}",
+        ]
+        if _USE_COLOR:
+            command.append("--colors")
+        command.extend(_jest_cache_args(project_dir))
+        if args.coverage:
+            command.append("--coverage")
+            command.append(f"--coverageDirectory=.coverage/shard-{i}")
+        if args.unit:
+            command.append("tests/unit")
+        elif args.integration:
+            command.append("tests/integration")
+        if args.verbose:
+            command.append("--verbose")
+        process = subprocess.Popen(
+            command,
+            cwd=project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=65536,
+        )
+        prefix = f"[shard {i}/{shards}] ".encode()
+        thread = threading.Thread(target=_pump_output, args=(process, prefix))
+        thread.start()
+        processes.append((process, thread))
+
+    exit_code = 0
+    for process, thread in processes:
+        thread.join()
+        exit_code = max(exit_code, process.wait())
+
+    if args.coverage and exit_code == 0:
+        log("Merging shard coverage...", Colors.BLUE)
+        out_path = _merge_shard_coverage(project_dir, shards)
+        log(f"Wrote merged coverage to {out_path}", Colors.GREEN)
+    return exit_code
+
+
+def run_tests(args, project_dir, allow_exec=False):
+    """Build the npm test command from the parsed args and stream its output.
+
+    Jest is invoked directly through node by default — going through
+    npm run spawns an extra npm process that parses package.json just to
+    re-spawn Jest. The npm path remains available via --via-npm or when
+    the Jest entry point cannot be found. With allow_exec=True the
+    interpreter is replaced with the command via execvp: one fewer
+    process and pipe, and Jest inherits the tty for native color and
+    watch-mode interactivity. Callers that need the return code (the
+    combined runner) leave allow_exec off.
+    """
+    jest_js = project_dir / "node_modules" / "jest" / "bin" / "jest.js"
+    if args.shards and not args.watch and not args.via_npm and jest_js.exists():
+        return run_sharded_tests(args, project_dir, jest_js)
+    if args.via_npm or not jest_js.exists():
+        if args.watch:
+            script = "test:watch"
+        elif args.coverage:
+            script = "test:coverage"
+        else:
+            script = "test"
+        command = [_npm(), "run", script]
+        extra = []
+        if args.unit:
+            extra.append("tests/unit")
+        elif args.integration:
+            extra.append("tests/integration")
+        if args.verbose:
+            extra.append("--verbose")
+        if extra:
+            command.append("--")
+            command.extend(extra)
+    else:
+        command = ["node", str(jest_js)]
+        command.extend(_jest_cache_args(project_dir))
+        if args.watch:
+            command.append("--watch")
+        else:
+            # Leave two cores of headroom so the machine stays responsive.
+            command.append(f"--maxWorkers={max(1, (os.cpu_count() or 2) - 2)}")
+        if args.coverage:
+            command.append("--coverage")
+        if args.unit:
+            command.append("tests/unit")
+        elif args.integration:
+            command.append("tests/integration")
+        if args.verbose:
+            command.append("--verbose")
+        # Jest only sees a pipe here, so its own tty detection says no;
+        # ask for colors when this runner's output is a color-capable tty
+        # (and never when NO_COLOR or a redirect disabled them).
+        if _USE_COLOR:
+            command.append("--colors")
+
+    log(f"Running: {' '.join(command)}", Colors.BLUE)
+
+    if allow_exec:
+        # exec replaces the process without running stdio cleanup; flush
+        # so the Running: line above survives in redirected runs.
+        sys.stdout.flush()
+        try:
+            os.chdir(project_dir)
+            os.execvp(command[0], command)
+        except OSError:
+            pass  # npm not spawnable this way; use the managed path
+
+    process = subprocess.Popen(
+        command,
+        cwd=project_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=65536,
+    )
+    stream_output(process)
+    return process.wait()
+
+
+def parse_arguments(argv=None):
+    """Parse the command line arguments for the JavaScript test runner."""
+    import argparse  # deferred: only needed at CLI entry, saves cold start
+
+    parser = argparse.ArgumentParser(description="Run the Jest test suite")
+    parser.add_argument("--unit", action="store_true", help="run only unit tests")
+    parser.add_argument(
+        "--integration", action="store_true", help="run only integration tests"
+    )
+    parser.add_argument("--coverage", action="store_true", help="collect coverage")
+    parser.add_argument("--watch", action="store_true", help="run Jest in watch mode")
+    parser.add_argument("--verbose", action="store_true", help="verbose Jest output")
+    parser.add_argument(
+        "--force-check",
+        action="store_true",
+        help="re-run the prerequisite checks even if cached as passing",
+    )
+    parser.add_argument(
+        "--run-scripts",
+        action="store_true",
+        help="run npm lifecycle scripts during installs even on CI",
+    )
+    parser.add_argument(
+        "--assume-ready",
+        action="store_true",
+        help="skip node/npm and dependency checks if the ready stamp matches",
+    )
+    parser.add_argument(
+        "--via-npm",
+        action="store_true",
+        help="run Jest through the npm run wrapper instead of directly",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        nargs="?",
+        const=-1,
+        help="fan out across N concurrent Jest shard processes "
+        "(bare flag: cpu count - 2)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point. Returns the Jest exit code."""
+    args = parse_arguments(argv)
+    project_dir = Path(__file__).resolve().parent.parent
+
+    print_header("JavaScript Test Runner")
+    # Watch-mode restarts (and anyone passing --assume-ready or inheriting
+    # WEBAPP_TESTS_READY) skip both checks when the ready stamp still
+    # matches the lockfile, so Jest boots without a single extra spawn.
+    assume_ready = not args.force_check and (
+        args.assume_ready or args.watch or os.environ.get("WEBAPP_TESTS_READY")
+    )
+    if assume_ready and _ready_stamp_ok(project_dir):
+        log("Dependencies marked ready, skipping checks", Colors.GREEN)
+    else:
+        if not check_prerequisites(project_dir, force=args.force_check):
+            return 1
+        if not check_dependencies(
+            project_dir, force=args.force_check, run_scripts=args.run_scripts
+        ):
+            return 1
+
+    # Standalone CLI runs (argv is None) may exec npm directly; the
+    # combined runner passes an argv list and needs the return code.
+    exit_code = run_tests(args, project_dir, allow_exec=argv is None)
+    if exit_code == 0:
+        log("All JavaScript tests passed", Colors.GREEN)
+    else:
+        log(f"JavaScript tests failed (exit code {exit_code})", Colors.RED)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())